@@ -1,24 +1,297 @@
 import os
+import sys
 import requests
 import json
+import re
+import glob
+import html
 import webbrowser
 import urllib.parse
 import base64
 import mimetypes
 import io
-import tempfile
-from msal import PublicClientApplication, SerializableTokenCache
+import time
+import random
+import atexit
+import threading
+import importlib.util
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# Pillow is only needed for clipboard images, so it is imported on first use
+PIL_AVAILABLE = importlib.util.find_spec('PIL') is not None
+
 try:
-    from PIL import ImageGrab, Image
-    PIL_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    PIL_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+# With CLIPBOARD_IMAGE_FORMAT=auto, opaque clipboard images with more pixels than
+# this are uploaded as JPEG at this quality
+JPEG_MIN_PIXELS = 2_000_000
+JPEG_QUALITY = 85
+
+# Upper bound on $batch requests sent in parallel (also the connection pool size).
+# Graph throttles per app and user, so raising this mostly trades speed for more
+# 429 responses.
+MAX_WORKERS = 8
+
+# Microsoft Graph accepts at most 20 sub-requests per JSON batch
+GRAPH_BATCH_LIMIT = 20
+
+# Batch rounds allowed without progress (e.g. throttled) before giving up
+BATCH_MAX_RETRIES = 3
+
+# Only the fields this module reads, to keep Graph list responses small
+_SELECT_NAMED = 'id,displayName'
+_SELECT_PAGES = 'id,title'
+_EXPAND_SECTIONS = f'sections($select={_SELECT_NAMED})'
+
+# Pages per response when listing a section (Graph returns 20 by default, at most 100)
+PAGES_PAGE_SIZE = 100
+
+# Seconds notebook, section and page lists are reused before being fetched again
+LIST_CACHE_TTL = 300
+
+# Most list responses kept for ETag revalidation; the oldest is dropped first
+_MAX_COLLECTION_ETAGS = 64
+
+# Seconds the default notebook/section IDs saved in ID_CACHE_FILE are trusted
+ID_CACHE_TTL = 24 * 60 * 60
+
+# Longest wait in seconds between retries when Graph gives no Retry-After
+BACKOFF_MAX = 30
+
+# Identifies this client in Graph request logs and throttling diagnostics
+_USER_AGENT = f'OneNoteAutomation/1.0 {requests.utils.default_user_agent()}'
+
+# Per-request header overrides; the session auth hook adds Authorization
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+_HTML_HEADERS = {'Content-Type': 'text/html'}
+
+# Udemy outline lines: unindented "1. Section title" and indented "   1.1. Page title"
+# (pages with an empty title do not match)
+_SECTION_LINE_RE = re.compile(r'(\d+)\s*\.\s*(.*?)\s*$')
+_PAGE_LINE_RE = re.compile(r'\s+(\d[^.]*?)\s*\.\s*([^.]*?)\s*\.\s*(.*?\S)\s*$')
+
+# Udemy page title builders per strategy: (section page title, lesson page title)
+_UDEMY_TITLE_STRATEGIES = {
+    # With numbering: "1. Week 1", "1.1. Day 1 - Lesson Title"
+    '1': (lambda sect: f"{sect['number']}. {sect['title']}",
+          lambda sect, page: f"{page['number']}. {page['title']}"),
+    # Without numbering: "Week 1", "Day 1 - Lesson Title"
+    '2': (lambda sect: sect['title'],
+          lambda sect, page: page['title']),
+    # With section prefix: "1. Week 1", "Week 1 - 1.1. Lesson Title"
+    '3': (lambda sect: f"{sect['number']}. {sect['title']}",
+          lambda sect, page: f"{sect['title']} - {page['number']}. {page['title']}")
+}
+
+# Accepted answers for yes/no and quit prompts
+_YES = frozenset({'y', 'yes'})
+_QUIT = frozenset({'q', 'quit'})
+
+# Page bodies filled by _create_html via %-formatting with escaped, UTF-8 encoded values
+_PAGE_HTML = b"""<!DOCTYPE html>
+<html>
+<head>
+    <title>%(title)s</title>
+    <meta name="created" content="%(created)s" />
+</head>
+<body>
+    <h1>%(title)s</h1>
+    <p>%(content)s</p>
+</body>
+</html>"""
+
+# Minimal page for empty content, without a duplicate title in the body
+_EMPTY_PAGE_HTML = b"""<!DOCTYPE html>
+<html>
+<head>
+    <title>%(title)s</title>
+    <meta name="created" content="%(created)s" />
+</head>
+<body>
+    <p></p>
+</body>
+</html>"""
+
+# Page with an image; image_src is "name:<part>" for uploads or the remote URL
+_IMAGE_PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <title>%(title)s</title>
+    <meta name="created" content="%(created)s" />
+</head>
+<body>
+    <h1>%(title)s</h1>
+    %(content)s
+    <img src="%(image_src)s" alt="%(title)s" style="max-width: 100%%; height: auto;" />
+</body>
+</html>"""
+
+# Multipart framing for image uploads: HTML "Presentation" part, then the image part header
+_MULTIPART_HEAD = (
+    b'--%(boundary)s\r\n'
+    b'Content-Disposition: form-data; name="Presentation"\r\n'
+    b'Content-Type: text/html\r\n'
+    b'\r\n'
+    b'%(html)s\r\n'
+    b'--%(boundary)s\r\n'
+    b'Content-Disposition: form-data; name="%(filename)s"\r\n'
+    b'Content-Type: %(content_type)s\r\n'
+    b'\r\n'
+)
+_MULTIPART_TAIL = b'\r\n--%(boundary)s--\r\n'
+
+# Content types for common image extensions; anything else falls back to mimetypes
+_IMAGE_CONTENT_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.tif': 'image/tiff',
+    '.tiff': 'image/tiff',
+    '.webp': 'image/webp'
+}
+
+_ENV_LOADED = False
+
+
+class GraphRetry(Retry):
+    """Retry policy for Graph calls.
+
+    Reads are retried on throttling, transient 5xx and network errors. POSTs create
+    pages, so they are only retried when Graph cannot have applied them: on 429/503,
+    which Graph returns without applying the request, and when the connection could
+    not be opened. A POST whose connection broke after it was sent (read timeout,
+    dropped connection) may already have created its page and is never replayed.
+    """
+    POST_STATUS_FORCELIST = frozenset({429, 503})
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == 'POST' and status_code not in self.POST_STATUS_FORCELIST:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if method == 'POST' and error is not None and not self._is_connection_error(error):
+            # read=False re-raises read errors, other=0 exhausts on any other error
+            no_replay = self.new(read=False, other=0)
+            return Retry.increment(no_replay, method, url, response, error, _pool, _stacktrace)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+    def get_backoff_time(self):
+        return _jittered_backoff(super().get_backoff_time())
+
+
+class _MultipartBody:
+    """Multipart request body that streams the image file between in-memory framing.
+
+    Provides __len__/read/tell/seek so requests sends a Content-Length and urllib3
+    can rewind the body when a throttled POST is retried.
+    """
+
+    def __init__(self, head, image_file, tail):
+        image_file.seek(0, io.SEEK_END)
+        image_size = image_file.tell()
+        self._parts = [(io.BytesIO(head), len(head)), (image_file, image_size), (io.BytesIO(tail), len(tail))]
+        self._size = len(head) + image_size + len(tail)
+        self._pos = 0
+
+    def __len__(self):
+        return self._size
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._size - self._pos
+
+        chunks = []
+        start = 0
+        for part, part_size in self._parts:
+            end = start + part_size
+            if size > 0 and start <= self._pos < end:
+                part.seek(self._pos - start)
+                data = part.read(min(size, end - self._pos))
+                chunks.append(data)
+                self._pos += len(data)
+                size -= len(data)
+            start = end
+
+        return b''.join(chunks)
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: allows bursts of `capacity` calls, then `rate` calls per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            # Reserve the token now (possibly going negative) so waiters queue in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that paces outgoing requests through a _TokenBucket (None disables pacing).
+
+    Retries triggered by 429/Retry-After still happen inside urllib3 via GraphRetry.
+    """
+
+    def __init__(self, limiter=None, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return super().send(request, **kwargs)
+
+
+def _jittered_backoff(delay):
+    """Stretch a backoff delay by up to 50% at random, capped at BACKOFF_MAX, so retries spread out"""
+    return min(BACKOFF_MAX, delay * (1 + random.random() * 0.5))
+
+
+def _ensure_env():
+    """Load .env into the environment once per process"""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
 
 class OneNoteAutomation:
     def __init__(self):
-        load_dotenv()
+        _ensure_env()
         self.client_id = os.getenv('CLIENT_ID')
         self.tenant_id = os.getenv('TENANT_ID', 'common')
         self.account_type = os.getenv('ACCOUNT_TYPE', 'personal')
@@ -29,6 +302,29 @@ class OneNoteAutomation:
         self.default_section = os.getenv('DEFAULT_SECTION', '').strip()
         self.default_page = os.getenv('DEFAULT_PAGE', '').strip()
         self.token_cache_file = os.getenv('TOKEN_CACHE_FILE', '.token_cache.json')
+        self.id_cache_file = os.getenv('ID_CACHE_FILE', '.id_cache.json')
+
+        # Opt-in: clipboard images larger than this (px, longest side) are scaled down
+        # before upload, trading resolution for size; 0 (default) uploads full size
+        try:
+            self.max_image_dim = int(os.getenv('MAX_IMAGE_DIM', '0'))
+        except ValueError:
+            print("⚠️ MAX_IMAGE_DIM must be a whole number of pixels; uploading full size")
+            self.max_image_dim = 0
+
+        # 'png' keeps clipboard images lossless (screenshots and text stay sharp);
+        # 'auto' uploads large opaque images, such as photos, as JPEG
+        self.clipboard_image_format = os.getenv('CLIPBOARD_IMAGE_FORMAT', 'png').strip().lower()
+        if self.clipboard_image_format not in ('png', 'auto'):
+            print("⚠️ CLIPBOARD_IMAGE_FORMAT must be 'png' or 'auto'; using png")
+            self.clipboard_image_format = 'png'
+
+        # Client-side pacing of Graph requests, so bursts stay under throttling limits; 0 disables
+        try:
+            self.max_rps = float(os.getenv('GRAPH_MAX_RPS', '10'))
+        except ValueError:
+            print("⚠️ GRAPH_MAX_RPS must be a number of requests per second; using 10")
+            self.max_rps = 10.0
 
         if not self.client_id:
             raise ValueError("Missing CLIENT_ID in environment variables. Please check your .env file.")
@@ -46,32 +342,134 @@ class OneNoteAutomation:
 
         self.graph_url = "https://graph.microsoft.com/v1.0"
 
-        # Initialize token cache
-        self.cache = SerializableTokenCache()
-        if os.path.exists(self.token_cache_file):
-            with open(self.token_cache_file, 'r') as f:
-                self.cache.deserialize(f.read())
-
-        # Use PublicClientApplication with token cache
-        self.app = PublicClientApplication(
-            client_id=self.client_id,
-            authority=self.authority,
-            token_cache=self.cache
+        # Shared HTTP session so Graph calls reuse pooled keep-alive connections.
+        # Throttled and transient 5xx responses are retried with exponential backoff,
+        # honoring Retry-After (see GraphRetry for which statuses POSTs retry on).
+        retry = GraphRetry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=(429, 500, 502, 503, 504),
+            # POST is listed only so GraphRetry can replay it on 429/503 and on failed
+            # connects; it never retries a POST that may have reached Graph
+            allowed_methods=frozenset(['GET', 'POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False
         )
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = _USER_AGENT
+        # One pooled socket per worker thread so concurrent page creation never opens
+        # throwaway connections; a few host pools cover Graph plus any redirect hosts.
+        limiter = _TokenBucket(self.max_rps, max(1.0, self.max_rps * 2)) if self.max_rps > 0 else None
+        self.session.mount('https://', _RateLimitedAdapter(limiter, pool_connections=4, pool_maxsize=MAX_WORKERS,
+                                                           pool_block=False, max_retries=retry))
+
+        # Token cache and MSAL application are created on first use, so msal (and its
+        # cryptography dependency) is only imported when a token is actually needed
+        self._cache = None
+        self._app = None
+        self._saved_cache_state = None
+        # Serializes saves from interactive sign-in and the atexit hook
+        self._token_cache_lock = threading.Lock()
+
+        # Flush any token refreshes that happen after authenticate() on exit
+        atexit.register(self._save_token_cache)
 
         self.access_token = None
         self.account = None
+        self._token_expires_at = 0
+        # One worker thread renews an expiring token while the others wait for it
+        self._token_lock = threading.Lock()
+        self.session.auth = self._authorize_request
 
         # Cache for default objects
         self._cached_notebook = None
         self._cached_section = None
         self._cached_page = None
 
+        # Default notebook/section IDs remembered across runs, so quick creation can
+        # skip the name lookups (entries expire after ID_CACHE_TTL seconds)
+        self._id_cache = self._load_id_cache()
+        self._defaults_from_id_cache = False
+
+        # Image found by the last check_clipboard_for_image(), used once by
+        # create_page_with_clipboard_image() instead of reading the clipboard again
+        self._checked_clipboard_image = None
+
+        # Notebook, section and page lists with their lowercased-name indexes,
+        # kept for LIST_CACHE_TTL seconds (or until reset_cache())
+        self._lists_expire_at = 0
+        self._clear_lists()
+
+        # Last ETag-carrying response per list URL, for conditional re-fetches
+        # once the lists above expire
+        self._collection_etags = {}
+
+    @property
+    def cache(self):
+        """MSAL token cache, loaded from token_cache_file on first use"""
+        if self._cache is None:
+            from msal import SerializableTokenCache
+
+            cache = SerializableTokenCache()
+            if os.path.exists(self.token_cache_file):
+                try:
+                    with open(self.token_cache_file, 'rb') as f:
+                        cache_state = f.read().decode('utf-8')
+                    if cache_state.strip():
+                        cache.deserialize(cache_state)
+                        self._saved_cache_state = cache_state
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Ignoring unreadable token cache ({str(e)}); you may need to sign in again")
+                    cache = SerializableTokenCache()
+            self._cache = cache
+        return self._cache
+
+    @property
+    def app(self):
+        """MSAL PublicClientApplication backed by the token cache, created on first use"""
+        if self._app is None:
+            from msal import PublicClientApplication
+
+            self._app = PublicClientApplication(
+                client_id=self.client_id,
+                authority=self.authority,
+                token_cache=self.cache
+            )
+        return self._app
+
+    def close(self):
+        """Release pooled HTTP connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _save_token_cache(self):
-        """Save token cache to file for persistence"""
-        if self.cache.has_state_changed:
-            with open(self.token_cache_file, 'w') as f:
-                f.write(self.cache.serialize())
+        """Save token cache to file for persistence (owner read/write only).
+
+        Writes go to a temporary file that is synced to disk and then replaces the
+        cache atomically, so an interrupted save never leaves a corrupt cache behind.
+        """
+        with self._token_cache_lock:
+            # Nothing to save if the cache was never loaded
+            if self._cache is None or not self._cache.has_state_changed:
+                return
+
+            cache_state = self.cache.serialize()
+            if cache_state == self._saved_cache_state:
+                return
+
+            temp_path = f"{self.token_cache_file}.tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(cache_state.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.token_cache_file)
+            self._saved_cache_state = cache_state
 
     def authenticate(self, force_reauth=False):
         """Authenticate with persistent token caching"""
@@ -82,9 +480,9 @@ class OneNoteAutomation:
                 print("🔄 Using cached authentication...")
                 result = self.app.acquire_token_silent(self.scope, account=accounts[0])
                 if result and "access_token" in result:
-                    self.access_token = result["access_token"]
+                    # Silent refreshes are written once at exit by the atexit hook
+                    self._store_token(result)
                     self.account = accounts[0]
-                    self._save_token_cache()
                     print("✅ Authentication successful!")
                     return True
 
@@ -99,7 +497,8 @@ class OneNoteAutomation:
                 )
 
                 if "access_token" in result:
-                    self.access_token = result["access_token"]
+                    # Save a new sign-in right away so a crash does not lose it
+                    self._store_token(result)
                     self.account = result.get("account")
                     self._save_token_cache()
                     print("✅ Authentication successful!")
@@ -115,27 +514,155 @@ class OneNoteAutomation:
             print(f"❌ Authentication error: {str(e)}")
             return False
 
-    def get_headers(self):
-        """Get headers for API requests"""
-        if not self.access_token:
-            raise ValueError("Not authenticated. Call authenticate() first.")
+    def _store_token(self, result):
+        """Keep an MSAL token result, refreshing 5 minutes before it expires"""
+        self.access_token = result["access_token"]
+        self._token_expires_at = time.time() + int(result.get("expires_in", 3600)) - 300
 
-        return {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
+    def _ensure_fresh_token(self):
+        """Silently renew the access token once it is close to expiry"""
+        if not self.access_token or time.time() < self._token_expires_at:
+            return
 
-    def get_notebooks(self):
-        """Get all notebooks for the authenticated user"""
+        with self._token_lock:
+            # Another thread may have renewed it while this one waited
+            if time.time() < self._token_expires_at:
+                return
+            account = self.account or next(iter(self.app.get_accounts()), None)
+            if account:
+                result = self.app.acquire_token_silent(self.scope, account=account)
+                if result and "access_token" in result:
+                    self._store_token(result)
+
+    def _authorize_request(self, request):
+        """Session auth hook: attach a current bearer token to every Graph request"""
+        self._ensure_fresh_token()
+        if self.access_token:
+            request.headers['Authorization'] = f'Bearer {self.access_token}'
+        return request
+
+    def _parse_response(self, response):
+        """Raise for an HTTP error status, then parse the Graph response body once.
+
+        Uses orjson when it is installed; an empty body (e.g. 204) parses as {}.
+        """
+        response.raise_for_status()
+        if not response.content:
+            return {}
+        if not ORJSON_AVAILABLE:
+            return response.json()
         try:
-            url = f"{self.graph_url}/me/onenote/notebooks"
-            response = requests.get(url, headers=self.get_headers())
-            response.raise_for_status()
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            # Match response.json() so callers' RequestException handlers still apply
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos, response=response)
+
+    def _dump_json(self, payload):
+        """Serialize a request payload to UTF-8 bytes, using orjson when it is installed"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(payload)
+        return json.dumps(payload).encode('utf-8')
+
+    def _post_batch(self, chunk):
+        """POST one $batch request (at most GRAPH_BATCH_LIMIT sub-requests) and return its sub-responses"""
+        response = self.session.post(f"{self.graph_url}/$batch", headers=_JSON_HEADERS,
+                                     data=self._dump_json({'requests': chunk}))
+        return self._parse_response(response).get('responses', [])
+
+    def _graph_batch(self, batch_requests):
+        """Send sub-requests through the Graph $batch endpoint and return responses keyed by id.
+
+        More than GRAPH_BATCH_LIMIT sub-requests are split into several $batch calls
+        sent concurrently, so callers that need ordering must pass a single chunk.
+        """
+        chunks = [batch_requests[start:start + GRAPH_BATCH_LIMIT]
+                  for start in range(0, len(batch_requests), GRAPH_BATCH_LIMIT)]
+        if len(chunks) <= 1:
+            batches = [self._post_batch(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks))) as executor:
+                batches = list(executor.map(self._post_batch, chunks))
+
+        return {sub_response['id']: sub_response for batch in batches for sub_response in batch}
 
-            notebooks = response.json().get('value', [])
-            print(f"📚 Found {len(notebooks)} notebooks:")
-            for nb in notebooks:
-                print(f"  📖 {nb['displayName']} (ID: {nb['id']})")
+    def _get_retry_after(self, headers):
+        """Get the Retry-After delay in seconds from response headers (0 if absent)"""
+        try:
+            return max(0, int((headers or {}).get('Retry-After', 0)))
+        except (TypeError, ValueError):
+            return 0
+
+    def _collection_key(self, url, params):
+        """Key of a list request in _collection_etags"""
+        return (url, tuple(sorted((params or {}).items())))
+
+    def _remember_collection(self, key, etag, body, content):
+        """Keep the ETag and raw body of a single-page list for If-None-Match revalidation"""
+        self._collection_etags.pop(key, None)
+        if not etag or '@odata.nextLink' in body:
+            return
+        self._collection_etags[key] = (etag, content)
+        if len(self._collection_etags) > _MAX_COLLECTION_ETAGS:
+            del self._collection_etags[next(iter(self._collection_etags))]
+
+    def _loads(self, content):
+        """Parse JSON bytes, using orjson when it is installed"""
+        return orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+
+    def _get_collection(self, url, params=None, first_page=None):
+        """GET a Graph collection, following @odata.nextLink until every item is read.
+
+        first_page: an already fetched response body (e.g. from $batch) to continue from.
+        """
+        if first_page is None:
+            # Revalidate a previously seen single-page list; 304 means reuse its body
+            key = self._collection_key(url, params)
+            cached = self._collection_etags.get(key)
+            headers = {'If-None-Match': cached[0]} if cached is not None else None
+            response = self.session.get(url, params=params, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                first_page = self._loads(cached[1])
+            else:
+                first_page = self._parse_response(response)
+                self._remember_collection(key, response.headers.get('ETag'), first_page, response.content)
+
+        items = first_page.get('value', [])
+        next_link = first_page.get('@odata.nextLink')
+        while next_link:
+            # nextLink already carries the original query options
+            response = self.session.get(next_link)
+            body = self._parse_response(response)
+            items.extend(body.get('value', []))
+            next_link = body.get('@odata.nextLink')
+
+        return items
+
+    def get_notebooks(self, expand_sections=False, verbose=True):
+        """Get all notebooks for the authenticated user (cached for LIST_CACHE_TTL seconds).
+
+        With expand_sections, each notebook's sections come back in the same
+        request and later get_sections() calls are served from memory.
+        verbose=False skips printing the list, for callers that show their own.
+        """
+        try:
+            self._expire_lists()
+            notebooks = self._notebooks_cache
+            if notebooks is None or (expand_sections and not self._notebooks_expanded):
+                url = f"{self.graph_url}/me/onenote/notebooks"
+                params = {'$select': _SELECT_NAMED}
+                if expand_sections:
+                    params['$expand'] = _EXPAND_SECTIONS
+                notebooks = self._get_collection(url, params)
+                if expand_sections:
+                    for nb in notebooks:
+                        self._cache_sections(nb['id'], nb.pop('sections', []))
+                self._notebook_index = self._build_name_index(notebooks, 'displayName')
+                self._notebooks_cache = notebooks
+                self._notebooks_expanded = expand_sections
+
+            if verbose:
+                print('\n'.join([f"📚 Found {len(notebooks)} notebooks:"] +
+                                [f"  📖 {nb['displayName']} (ID: {nb['id']})" for nb in notebooks]))
 
             return notebooks
         except requests.exceptions.RequestException as e:
@@ -145,65 +672,38 @@ class OneNoteAutomation:
                 print(f"Response text: {e.response.text}")
             return []
 
-    def get_sections(self, notebook_id):
-        """Get all sections in a notebook"""
+    def get_sections(self, notebook_id, verbose=True):
+        """Get all sections in a notebook (cached per notebook for LIST_CACHE_TTL seconds)"""
         try:
-            url = f"{self.graph_url}/me/onenote/notebooks/{notebook_id}/sections"
-            response = requests.get(url, headers=self.get_headers())
-            response.raise_for_status()
+            self._expire_lists()
+            sections = self._sections_cache.get(notebook_id)
+            if sections is None:
+                url = f"{self.graph_url}/me/onenote/notebooks/{notebook_id}/sections"
+                sections = self._get_collection(url, {'$select': _SELECT_NAMED})
+                self._cache_sections(notebook_id, sections)
 
-            sections = response.json().get('value', [])
-            print(f"📂 Found {len(sections)} sections:")
-            for section in sections:
-                print(f"  📄 {section['displayName']} (ID: {section['id']})")
+            if verbose:
+                print('\n'.join([f"📂 Found {len(sections)} sections:"] +
+                                [f"  📄 {section['displayName']} (ID: {section['id']})" for section in sections]))
 
             return sections
         except requests.exceptions.RequestException as e:
             print(f"❌ Error getting sections: {str(e)}")
             return []
 
-    def create_page(self, section_id, page_title, page_content=""):
-        """Create a new page in a specific section"""
+    def create_page(self, section_id, page_title, page_content="", created_at=None):
+        """Create a new page in a specific section (created_at: shared ISO timestamp for bulk runs)"""
         try:
             url = f"{self.graph_url}/me/onenote/sections/{section_id}/pages"
+            self._forget_pages(section_id)
 
             # Escape HTML characters in title to preserve exact formatting
-            import html
             escaped_title = html.escape(page_title)
 
-            # Create HTML content for the page - only add heading if there's content
-            if page_content.strip():
-                html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>{escaped_title}</title>
-    <meta name="created" content="{self._get_current_datetime()}" />
-</head>
-<body>
-    <h1>{escaped_title}</h1>
-    <p>{page_content}</p>
-</body>
-</html>"""
-            else:
-                # For empty content, create minimal page without duplicate title in body
-                html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>{escaped_title}</title>
-    <meta name="created" content="{self._get_current_datetime()}" />
-</head>
-<body>
-    <p></p>
-</body>
-</html>"""
-
-            headers = self.get_headers()
-            headers['Content-Type'] = 'text/html'
-
-            response = requests.post(url, headers=headers, data=html_content.encode('utf-8'))
-            response.raise_for_status()
+            html_content = self._create_html(escaped_title, page_content, created_at)
 
-            page_data = response.json()
+            response = self.session.post(url, headers=_HTML_HEADERS, data=html_content)
+            page_data = self._parse_response(response)
             print(f"✅ Page '{page_title}' created successfully!")
             print(f"   📄 Page ID: {page_data.get('id')}")
 
@@ -224,9 +724,9 @@ class OneNoteAutomation:
         """Create a new page with an embedded image"""
         try:
             url = f"{self.graph_url}/me/onenote/sections/{section_id}/pages"
+            self._forget_pages(section_id)
 
             # Escape HTML characters in title to preserve exact formatting
-            import html
             escaped_title = html.escape(page_title)
 
             # Create HTML content with image
@@ -239,13 +739,8 @@ class OneNoteAutomation:
                 # Remote image URL
                 html_content = self._create_html_with_remote_image(escaped_title, image_url, page_content)
 
-                headers = self.get_headers()
-                headers['Content-Type'] = 'text/html'
-
-                response = requests.post(url, headers=headers, data=html_content.encode('utf-8'))
-                response.raise_for_status()
-
-                page_data = response.json()
+                response = self.session.post(url, headers=_HTML_HEADERS, data=html_content.encode('utf-8'))
+                page_data = self._parse_response(response)
                 print(f"✅ Page '{page_title}' with image created successfully!")
                 return page_data
             else:
@@ -266,8 +761,13 @@ class OneNoteAutomation:
             return None
 
         try:
-            # Get image from clipboard
-            clipboard_image = ImageGrab.grabclipboard()
+            from PIL import ImageGrab, Image
+
+            # Reuse the image the user was just shown, otherwise read the clipboard
+            clipboard_image = self._checked_clipboard_image
+            self._checked_clipboard_image = None
+            if clipboard_image is None:
+                clipboard_image = ImageGrab.grabclipboard()
 
             if clipboard_image is None:
                 print("❌ No image found in clipboard. Please copy an image first.")
@@ -281,44 +781,40 @@ class OneNoteAutomation:
             print(f"   📏 Size: {clipboard_image.size[0]}x{clipboard_image.size[1]} pixels")
             print(f"   🎨 Mode: {clipboard_image.mode}")
 
-            # Save clipboard image to temporary file
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            temp_path = temp_file.name
-            temp_file.close()
+            # When MAX_IMAGE_DIM is set, skip encoding and uploading pixels OneNote would scale away
+            if self.max_image_dim > 0 and max(clipboard_image.size) > self.max_image_dim:
+                resampling = getattr(Image, 'Resampling', Image)
+                clipboard_image.thumbnail((self.max_image_dim, self.max_image_dim), resampling.LANCZOS)
+                print(f"   📐 Scaled down to {clipboard_image.size[0]}x{clipboard_image.size[1]} pixels")
 
             # Convert to RGB if necessary (for PNG compatibility)
+            had_transparency = clipboard_image.mode in ('RGBA', 'LA') or 'transparency' in clipboard_image.info
             if clipboard_image.mode in ('RGBA', 'LA'):
-                # Create white background for transparent images
-                background = Image.new('RGB', clipboard_image.size, (255, 255, 255))
-                if clipboard_image.mode == 'RGBA':
-                    background.paste(clipboard_image, mask=clipboard_image.split()[-1])
-                else:
-                    background.paste(clipboard_image)
-                clipboard_image = background
+                # Flatten transparency onto white in a single compositing pass
+                background = Image.new('RGBA', clipboard_image.size, (255, 255, 255, 255))
+                clipboard_image = Image.alpha_composite(background, clipboard_image.convert('RGBA')).convert('RGB')
             elif clipboard_image.mode != 'RGB':
                 clipboard_image = clipboard_image.convert('RGB')
 
-            # Save as PNG
-            clipboard_image.save(temp_path, 'PNG', optimize=True)
-
-            print(f"💾 Saved clipboard image to temporary file: {temp_path}")
-
-            # Create page with the temporary image
-            result = self.create_page_with_image(
-                section_id=section_id,
-                page_title=page_title,
-                image_path=temp_path,
-                page_content=page_content
-            )
+            # Encode in memory as lossless PNG at a fast zlib level, since the upload is
+            # short-lived and size barely matters. In 'auto' mode large opaque images
+            # (photos) encode faster and upload much smaller as JPEG
+            image_buffer = io.BytesIO()
+            if (self.clipboard_image_format == 'auto' and not had_transparency
+                    and clipboard_image.size[0] * clipboard_image.size[1] > JPEG_MIN_PIXELS):
+                clipboard_image.save(image_buffer, 'JPEG', quality=JPEG_QUALITY)
+                image_name = 'clipboard.jpg'
+            else:
+                clipboard_image.save(image_buffer, 'PNG', compress_level=1)
+                image_name = 'clipboard.png'
 
-            # Clean up temporary file
-            try:
-                os.unlink(temp_path)
-                print("🗑️ Cleaned up temporary file")
-            except:
-                pass  # Ignore cleanup errors
+            print(f"💾 Encoded clipboard image in memory as {image_name} ({image_buffer.tell() // 1024} KB)")
 
-            return result
+            # Upload straight from the buffer, no temporary file
+            url = f"{self.graph_url}/me/onenote/sections/{section_id}/pages"
+            self._forget_pages(section_id)
+            html_content = self._create_html_with_local_image(html.escape(page_title), image_name, page_content)
+            return self._create_page_multipart(url, html_content, image_name, image_file=image_buffer)
 
         except Exception as e:
             print(f"❌ Error creating page with clipboard image: {str(e)}")
@@ -330,6 +826,9 @@ class OneNoteAutomation:
             return False, "PIL (Pillow) library not installed"
 
         try:
+            from PIL import ImageGrab, Image
+
+            self._checked_clipboard_image = None
             clipboard_image = ImageGrab.grabclipboard()
             if clipboard_image is None:
                 return False, "No content in clipboard"
@@ -337,89 +836,79 @@ class OneNoteAutomation:
             if not isinstance(clipboard_image, Image.Image):
                 return False, "Clipboard content is not an image"
 
+            self._checked_clipboard_image = clipboard_image
             return True, f"Image found: {clipboard_image.size[0]}x{clipboard_image.size[1]} pixels, {clipboard_image.mode} mode"
 
         except Exception as e:
             return False, f"Error checking clipboard: {str(e)}"
 
+    def discard_clipboard_image(self):
+        """Forget the image kept by check_clipboard_for_image() once the user declines it"""
+        self._checked_clipboard_image = None
+
+    def _create_html(self, title, content="", created_at=None):
+        """Create the UTF-8 HTML body for a page - only add heading if there's content.
+
+        The title must already be escaped; content is plain text and is escaped here.
+        """
+        fields = {
+            b'title': title.encode('utf-8'),
+            b'created': (created_at or self._get_current_datetime()).encode('ascii'),
+            b'content': html.escape(content).encode('utf-8')
+        }
+        if content.strip():
+            return _PAGE_HTML % fields
+        return _EMPTY_PAGE_HTML % fields
+
     def _create_html_with_local_image(self, title, image_path, content=""):
         """Create HTML content with local image reference"""
-        filename = os.path.basename(image_path)
-
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>{title}</title>
-    <meta name="created" content="{self._get_current_datetime()}" />
-</head>
-<body>
-    <h1>{title}</h1>
-    {f'<p>{content}</p>' if content else ''}
-    <img src="name:{filename}" alt="{title}" style="max-width: 100%; height: auto;" />
-</body>
-</html>"""
-        return html_content
+        return self._create_html_with_image(title, f"name:{os.path.basename(image_path)}", content)
 
     def _create_html_with_remote_image(self, title, image_url, content=""):
         """Create HTML content with remote image URL"""
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>{title}</title>
-    <meta name="created" content="{self._get_current_datetime()}" />
-</head>
-<body>
-    <h1>{title}</h1>
-    {f'<p>{content}</p>' if content else ''}
-    <img src="{image_url}" alt="{title}" style="max-width: 100%; height: auto;" />
-</body>
-</html>"""
-        return html_content
-
-    def _create_page_multipart(self, url, html_content, image_path):
-        """Create a page with multipart request for local image"""
-        import uuid
+        return self._create_html_with_image(title, image_url, content)
+
+    def _create_html_with_image(self, title, image_src, content=""):
+        """Fill the image page template; content is plain text and gets escaped here"""
+        return _IMAGE_PAGE_HTML % {
+            'title': title,
+            'created': self._get_current_datetime(),
+            'content': f'<p>{html.escape(content)}</p>' if content else '',
+            'image_src': html.escape(image_src)
+        }
 
+    def _create_page_multipart(self, url, html_content, image_path, image_file=None):
+        """Create a page with multipart request for local image (read from image_file if given)"""
         # Generate boundary for multipart request
-        boundary = f"Part_{uuid.uuid4().hex}"
+        boundary = f"Part_{os.urandom(16).hex()}"
 
         # Get image content type
-        content_type, _ = mimetypes.guess_type(image_path)
+        content_type = _IMAGE_CONTENT_TYPES.get(os.path.splitext(image_path)[1].lower())
         if not content_type:
-            content_type = 'application/octet-stream'
-
-        # Read image file
-        with open(image_path, 'rb') as image_file:
-            image_data = image_file.read()
+            content_type = mimetypes.guess_type(image_path)[0] or 'application/octet-stream'
 
         filename = os.path.basename(image_path)
 
-        # Create multipart body
-        multipart_body = f"""--{boundary}\r
-Content-Disposition: form-data; name="Presentation"\r
-Content-Type: text/html\r
-\r
-{html_content}\r
---{boundary}\r
-Content-Disposition: form-data; name="{filename}"\r
-Content-Type: {content_type}\r
-\r
-""".encode('utf-8')
-
-        multipart_body += image_data
-        multipart_body += f"\r\n--{boundary}--\r\n".encode('utf-8')
+        # Multipart framing around the image, which is streamed from disk
+        framing = {
+            b'boundary': boundary.encode('ascii'),
+            b'html': html_content.encode('utf-8'),
+            b'filename': filename.encode('utf-8'),
+            b'content_type': content_type.encode('ascii')
+        }
+        head = _MULTIPART_HEAD % framing
+        tail = _MULTIPART_TAIL % framing
 
         # Set headers for multipart request
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': f'multipart/form-data; boundary={boundary}'
-        }
+        headers = {'Content-Type': f'multipart/form-data; boundary={boundary}'}
 
         try:
-            response = requests.post(url, headers=headers, data=multipart_body)
-            response.raise_for_status()
-
-            page_data = response.json()
+            if image_file is not None:
+                response = self.session.post(url, headers=headers, data=_MultipartBody(head, image_file, tail))
+            else:
+                with open(image_path, 'rb') as image_file:
+                    response = self.session.post(url, headers=headers, data=_MultipartBody(head, image_file, tail))
+            page_data = self._parse_response(response)
             print(f"✅ Page with image created successfully!")
             print(f"   📄 Page ID: {page_data.get('id')}")
 
@@ -438,62 +927,257 @@ Content-Type: {content_type}\r
             return None
 
     def _get_current_datetime(self):
-        """Get current datetime in ISO format"""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        """Get current local datetime in ISO format with UTC offset, to the second"""
+        return datetime.now().astimezone().isoformat(timespec='seconds')
+
+    def _clear_lists(self):
+        """Forget all cached notebook, section and page lists"""
+        self._notebooks_cache = None
+        self._notebooks_expanded = False
+        self._notebook_index = None
+        self._sections_cache = {}
+        self._section_index = {}
+        # Pages per section are also dropped whenever a page is created there
+        self._pages_cache = {}
+        self._page_index = {}
+
+    def _expire_lists(self):
+        """Clear the cached lists once they are older than LIST_CACHE_TTL"""
+        now = time.monotonic()
+        if now >= self._lists_expire_at:
+            self._clear_lists()
+            self._lists_expire_at = now + LIST_CACHE_TTL
+
+    def _cache_pages(self, section_id, pages):
+        """Remember a section's pages and index them by lowercased title"""
+        self._pages_cache[section_id] = pages
+        self._page_index[section_id] = self._build_name_index(pages, 'title')
+
+    def _forget_pages(self, section_id):
+        """Drop a section's cached pages after a page was created in it"""
+        self._pages_cache.pop(section_id, None)
+        self._page_index.pop(section_id, None)
+        self._collection_etags.pop(self._pages_key(section_id), None)
+
+    def _pages_key(self, section_id):
+        """Revalidation key of a section's page list, as fetched by get_pages and get_pages_batch"""
+        return self._collection_key(f"{self.graph_url}/me/onenote/sections/{section_id}/pages",
+                                    {'$select': _SELECT_PAGES, '$top': PAGES_PAGE_SIZE})
+
+    def _cache_sections(self, notebook_id, sections):
+        """Remember a notebook's sections and index them by lowercased name"""
+        self._sections_cache[notebook_id] = sections
+        self._section_index[notebook_id] = self._build_name_index(sections, 'displayName')
+
+    def _build_name_index(self, items, name_key):
+        """Map lowercased names to items, keeping the first item for duplicate names"""
+        index = {}
+        for item in items:
+            index.setdefault(item[name_key].lower(), item)
+        return index
 
     def find_notebook_by_name(self, notebook_name):
-        """Find a notebook by name (case-insensitive)"""
-        notebooks = self.get_notebooks()
-        for notebook in notebooks:
-            if notebook['displayName'].lower() == notebook_name.lower():
-                return notebook
-        return None
+        """Find a notebook by name (case-insensitive), fetching notebooks only once"""
+        self._expire_lists()
+        if self._notebook_index is None:
+            self.get_notebooks(expand_sections=True, verbose=False)
+        return (self._notebook_index or {}).get(notebook_name.lower())
 
     def find_section_by_name(self, notebook_id, section_name):
-        """Find a section by name in a specific notebook (case-insensitive)"""
-        sections = self.get_sections(notebook_id)
-        for section in sections:
-            if section['displayName'].lower() == section_name.lower():
-                return section
-        return None
-
-    def get_pages(self, section_id):
-        """Get all pages in a section"""
+        """Find a section by name in a specific notebook (case-insensitive), fetching sections only once"""
+        self._expire_lists()
+        if notebook_id not in self._section_index:
+            self.get_sections(notebook_id, verbose=False)
+        return self._section_index.get(notebook_id, {}).get(section_name.lower())
+
+    def get_pages(self, section_id, verbose=True):
+        """Get all pages in a section (cached per section for LIST_CACHE_TTL seconds)"""
         try:
-            url = f"{self.graph_url}/me/onenote/sections/{section_id}/pages"
-            response = requests.get(url, headers=self.get_headers())
-            response.raise_for_status()
+            self._expire_lists()
+            pages = self._pages_cache.get(section_id)
+            if pages is None:
+                url = f"{self.graph_url}/me/onenote/sections/{section_id}/pages"
+                pages = self._get_collection(url, {'$select': _SELECT_PAGES, '$top': PAGES_PAGE_SIZE})
+                self._cache_pages(section_id, pages)
 
-            pages = response.json().get('value', [])
-            print(f"📄 Found {len(pages)} pages:")
-            for page in pages:
-                print(f"  📝 {page['title']} (ID: {page['id']})")
+            if verbose:
+                print('\n'.join([f"📄 Found {len(pages)} pages:"] +
+                                [f"  📝 {page['title']} (ID: {page['id']})" for page in pages]))
 
             return pages
         except requests.exceptions.RequestException as e:
             print(f"❌ Error getting pages: {str(e)}")
             return []
 
+    def get_pages_batch(self, section_ids):
+        """Get pages for several sections through $batch, up to 20 sections per HTTP request.
+
+        Sections with cached pages are not requested again and sections whose
+        sub-request fails are fetched individually. Returns pages per section id.
+        """
+        self._expire_lists()
+        page_query = f"$select={_SELECT_PAGES}&$top={PAGES_PAGE_SIZE}"
+        batch_requests = []
+        for i, section_id in enumerate(section_ids):
+            if section_id not in self._pages_cache:
+                sub_request = {'id': str(i), 'method': 'GET', 'url': f"/me/onenote/sections/{section_id}/pages?{page_query}"}
+                cached = self._collection_etags.get(self._pages_key(section_id))
+                if cached is not None:
+                    sub_request['headers'] = {'If-None-Match': cached[0]}
+                batch_requests.append(sub_request)
+        try:
+            responses = self._graph_batch(batch_requests) if batch_requests else {}
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error getting pages in batch: {str(e)}")
+            responses = {}
+
+        pages_by_section = {}
+        for i, section_id in enumerate(section_ids):
+            if section_id in self._pages_cache:
+                pages_by_section[section_id] = self._pages_cache[section_id]
+                continue
+
+            sub_response = responses.get(str(i), {})
+            status = sub_response.get('status', 0)
+            cached = self._collection_etags.get(self._pages_key(section_id))
+            pages = None
+            if status == 304 and cached is not None:
+                pages = self._loads(cached[1]).get('value', [])
+                self._cache_pages(section_id, pages)
+            elif 200 <= status < 300:
+                body = sub_response.get('body', {})
+                etag = (sub_response.get('headers') or {}).get('ETag')
+                self._remember_collection(self._pages_key(section_id), etag, body, etag and self._dump_json(body))
+                try:
+                    # Sections with many pages continue through @odata.nextLink
+                    pages = self._get_collection(None, first_page=body)
+                    self._cache_pages(section_id, pages)
+                except requests.exceptions.RequestException:
+                    pass
+            if pages is None:
+                pages = self.get_pages(section_id, verbose=False)
+            pages_by_section[section_id] = pages
+
+        return pages_by_section
+
     def find_page_by_title(self, section_id, page_title):
-        """Find a page by title in a specific section (case-insensitive)"""
-        pages = self.get_pages(section_id)
-        for page in pages:
-            if page['title'].lower() == page_title.lower():
-                return page
-        return None
+        """Find a page by title in a specific section (case-insensitive).
+
+        Without cached pages for the section, a filtered query asks Graph for just
+        that title and its answer (a match or None) is returned as is, without filling
+        the section's page index; the section is listed only if the query fails.
+        """
+        self._expire_lists()
+        if section_id not in self._page_index:
+            title = page_title.lower().replace("'", "''")
+            params = {
+                '$filter': f"tolower(title) eq '{title}'",
+                '$select': _SELECT_PAGES,
+                '$top': 1
+            }
+            try:
+                response = self.session.get(f"{self.graph_url}/me/onenote/sections/{section_id}/pages", params=params)
+                pages = self._parse_response(response).get('value', [])
+                return pages[0] if pages else None
+            except requests.exceptions.RequestException:
+                self.get_pages(section_id, verbose=False)
+        return self._page_index.get(section_id, {}).get(page_title.lower())
+
+    def create_pages_batch(self, section_id, page_titles, page_content=""):
+        """Create pages through the Graph $batch endpoint, up to 20 per HTTP request.
+
+        Sub-requests are chained with dependsOn so pages are created in list order.
+        Returns the created page data (or None) for each title.
+        """
+        return self._create_pages_batch(section_id, page_titles, page_content)[0]
+
+    def _create_pages_batch(self, section_id, page_titles, page_content=""):
+        """Batch-create pages; returns (results, indexes of pages Graph definitely did not create).
+
+        Only pages answered with 424/429/503 or never sent are reported as not created;
+        a page that failed otherwise, or was in a batch whose request broke, may exist.
+        """
+        url = f"/me/onenote/sections/{section_id}/pages"
+        self._forget_pages(section_id)
+        created_at = self._get_current_datetime()
+        results = [None] * len(page_titles)
+        pending = list(range(len(page_titles)))
+        attempts = 0
+
+        while pending and attempts < BATCH_MAX_RETRIES:
+            retry = []
+            retry_after = 0
+            throttled = False
+
+            for start in range(0, len(pending), GRAPH_BATCH_LIMIT):
+                chunk = pending[start:start + GRAPH_BATCH_LIMIT]
+                batch_requests = []
+                for i in chunk:
+                    html_content = self._create_html(html.escape(page_titles[i]), page_content, created_at)
+                    sub_request = {
+                        'id': str(i),
+                        'method': 'POST',
+                        'url': url,
+                        'headers': {'Content-Type': 'text/html'},
+                        'body': base64.b64encode(html_content).decode('ascii')
+                    }
+                    if batch_requests:
+                        sub_request['dependsOn'] = [batch_requests[-1]['id']]
+                    batch_requests.append(sub_request)
+
+                try:
+                    responses = self._graph_batch(batch_requests)
+                except requests.exceptions.RequestException as e:
+                    print(f"❌ Error creating pages in batch: {str(e)}")
+                    # This chunk may have been applied; only the chunks after it were never sent
+                    return results, pending[start + GRAPH_BATCH_LIMIT:]
+
+                for i in chunk:
+                    sub_response = responses.get(str(i), {})
+                    status = sub_response.get('status', 0)
+                    if 200 <= status < 300:
+                        results[i] = sub_response.get('body')
+                    elif status in (424, 429, 503):
+                        # Not applied: throttled, or skipped after an earlier page in the chain failed
+                        retry.append(i)
+                        if status != 424:
+                            throttled = True
+                            retry_after = max(retry_after, self._get_retry_after(sub_response.get('headers')))
+
+                if retry:
+                    # Keep page order: later chunks wait until the retried pages are created
+                    retry.extend(pending[start + GRAPH_BATCH_LIMIT:])
+                    break
+
+            if len(retry) == len(pending):
+                attempts += 1
+            if throttled:
+                time.sleep(retry_after or _jittered_backoff(2 ** attempts))
+            pending = retry
+
+        return results, pending
 
     def create_multiple_pages(self, section_id, page_titles, page_content=""):
-        """Create multiple pages with given titles"""
+        """Create multiple pages with given titles.
+
+        Pages are created in order through the Graph $batch endpoint; pages the batch
+        definitely did not create are retried one at a time, in order. Pages that may
+        already exist are reported as failed rather than sent again.
+        """
         created_pages = []
         failed_pages = []
 
         print(f"📝 Creating {len(page_titles)} pages...")
 
-        for i, title in enumerate(page_titles, 1):
-            print(f"Creating page {i}/{len(page_titles)}: '{title}'")
+        results, not_created = self._create_pages_batch(section_id, page_titles, page_content)
+
+        if not_created:
+            print(f"🔄 Retrying {len(not_created)} pages individually...")
+            created_at = self._get_current_datetime()
+            for i in not_created:
+                results[i] = self.create_page(section_id, page_titles[i], page_content, created_at)
 
-            page_data = self.create_page(section_id, title, page_content)
+        for title, page_data in zip(page_titles, results):
             if page_data:
                 created_pages.append(page_data)
                 print(f"✅ Created: '{title}'")
@@ -510,13 +1194,98 @@ Content-Type: {content_type}\r
 
         return created_pages, failed_pages
 
+    def _find_notebook_with_sections(self, notebook_name):
+        """Look up one notebook and its sections with a single filtered request.
+
+        Falls back to the full notebook listing if the filtered query fails or matches nothing.
+        """
+        self._expire_lists()
+        if self._notebook_index is None:
+            name = notebook_name.lower().replace("'", "''")
+            params = {
+                '$filter': f"tolower(displayName) eq '{name}'",
+                '$select': _SELECT_NAMED,
+                '$expand': _EXPAND_SECTIONS
+            }
+            try:
+                response = self.session.get(f"{self.graph_url}/me/onenote/notebooks", params=params)
+                notebooks = self._parse_response(response).get('value', [])
+            except requests.exceptions.RequestException:
+                notebooks = []
+
+            if notebooks:
+                notebook = notebooks[0]
+                self._cache_sections(notebook['id'], notebook.pop('sections', []))
+                return notebook
+
+        return self.find_notebook_by_name(notebook_name)
+
+    def _load_id_cache(self):
+        """Load saved notebook/section IDs, ignoring a missing or unreadable file"""
+        try:
+            with open(self.id_cache_file, 'rb') as f:
+                id_cache = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+            return id_cache if isinstance(id_cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _get_cached_id(self, key):
+        """Return a saved {'id', 'displayName'} entry, or None if missing, malformed or older than ID_CACHE_TTL"""
+        entry = self._id_cache.get(key)
+        if not isinstance(entry, dict):
+            return None
+        item_id, name, ts = entry.get('id'), entry.get('displayName'), entry.get('ts')
+        if not (isinstance(item_id, str) and item_id and isinstance(name, str)
+                and isinstance(ts, (int, float)) and not isinstance(ts, bool)):
+            return None
+        if time.time() - ts < ID_CACHE_TTL:
+            return {'id': item_id, 'displayName': name}
+        return None
+
+    def _remember_ids(self, entries):
+        """Save looked-up IDs (key -> item) to ID_CACHE_FILE; None items drop their key"""
+        now = time.time()
+        changed = False
+        for key, item in entries.items():
+            if item is None:
+                changed = self._id_cache.pop(key, None) is not None or changed
+            else:
+                self._id_cache[key] = {'id': item['id'], 'displayName': item['displayName'], 'ts': now}
+                changed = True
+        if not changed:
+            return
+
+        temp_path = f"{self.id_cache_file}.tmp"
+        try:
+            # Synced before the rename, as in _save_token_cache, so a crash never leaves a torn file
+            with open(temp_path, 'wb') as f:
+                f.write(self._dump_json(self._id_cache))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.id_cache_file)
+        except OSError as e:
+            print(f"⚠️ Could not save ID cache: {str(e)}")
+
+    def _notebook_id_key(self):
+        return f"notebook:{self.default_notebook.lower()}"
+
+    def _section_id_key(self):
+        return f"section:{self.default_notebook.lower()}/{self.default_section.lower()}"
+
     def get_default_notebook(self):
-        """Get or cache the default notebook"""
+        """Get or cache the default notebook (IDs are reused from ID_CACHE_FILE when fresh)"""
         if self._cached_notebook is None:
             if self.default_notebook:
+                self._cached_notebook = self._get_cached_id(self._notebook_id_key())
+                if self._cached_notebook:
+                    self._defaults_from_id_cache = True
+                    print(f"✅ Using saved default notebook: '{self._cached_notebook['displayName']}'")
+                    return self._cached_notebook
+
                 print(f"🔍 Looking for default notebook: '{self.default_notebook}'")
-                self._cached_notebook = self.find_notebook_by_name(self.default_notebook)
+                self._cached_notebook = self._find_notebook_with_sections(self.default_notebook)
                 if self._cached_notebook:
+                    self._remember_ids({self._notebook_id_key(): self._cached_notebook})
                     print(f"✅ Found default notebook: '{self._cached_notebook['displayName']}'")
                 else:
                     print(f"❌ Default notebook '{self.default_notebook}' not found")
@@ -530,9 +1299,16 @@ Content-Type: {content_type}\r
         if self._cached_section is None:
             notebook = self.get_default_notebook()
             if notebook and self.default_section:
+                self._cached_section = self._get_cached_id(self._section_id_key())
+                if self._cached_section:
+                    self._defaults_from_id_cache = True
+                    print(f"✅ Using saved default section: '{self._cached_section['displayName']}'")
+                    return self._cached_section
+
                 print(f"🔍 Looking for default section: '{self.default_section}'")
                 self._cached_section = self.find_section_by_name(notebook['id'], self.default_section)
                 if self._cached_section:
+                    self._remember_ids({self._section_id_key(): self._cached_section})
                     print(f"✅ Found default section: '{self._cached_section['displayName']}'")
                 else:
                     print(f"❌ Default section '{self.default_section}' not found")
@@ -544,20 +1320,55 @@ Content-Type: {content_type}\r
 
         return self._cached_section
 
+    def _section_exists(self, section_id):
+        """Check a section ID; only a 404 from Graph counts as missing"""
+        try:
+            response = self.session.get(f"{self.graph_url}/me/onenote/sections/{section_id}", params={'$select': 'id'})
+        except requests.exceptions.RequestException:
+            return True
+        return response.status_code != 404
+
+    def with_default_section(self, action, succeeded=bool):
+        """Run action(section) on the default section and return its result.
+
+        If it does not succeed and the section came from ID_CACHE_FILE, check the saved ID;
+        when the section is gone the saved IDs are dropped, looked up again, and action retried once.
+        Returns None when there is no default section.
+        """
+        section = self.get_default_section()
+        if not section:
+            return None
+
+        result = action(section)
+        if not succeeded(result) and self._defaults_from_id_cache and not self._section_exists(section['id']):
+            print("🔄 Saved default section no longer exists, looking it up again...")
+            self._forget_default_ids()
+            section = self.get_default_section()
+            if section:
+                result = action(section)
+        return result
+
     def quick_create_page(self, page_title, page_content=""):
         """Quickly create a page using default notebook and section"""
-        section = self.get_default_section()
-        if section:
-            return self.create_page(section['id'], page_title, page_content)
+        if self.get_default_section():
+            return self.with_default_section(lambda section: self.create_page(section['id'], page_title, page_content))
         else:
             print("❌ Cannot create page: no default section available")
             return None
 
-    def reset_cache(self):
-        """Reset cached notebook, section, and page objects"""
+    def _forget_default_ids(self):
+        """Drop the default notebook/section, including the IDs saved in ID_CACHE_FILE"""
+        self._remember_ids({self._notebook_id_key(): None, self._section_id_key(): None})
         self._cached_notebook = None
         self._cached_section = None
+        self._defaults_from_id_cache = False
+
+    def reset_cache(self):
+        """Reset cached notebook, section, and page objects"""
+        self._forget_default_ids()
         self._cached_page = None
+        self._clear_lists()
+        self._collection_etags = {}
         print("🔄 Cache reset")
 
     def list_all_structure(self):
@@ -565,15 +1376,21 @@ Content-Type: {content_type}\r
         print("🏗️ OneNote Structure:")
         print("=" * 50)
 
-        notebooks = self.get_notebooks()
+        # Sections come back with the notebooks; OneNote cannot expand pages, so those
+        # are fetched for all sections together through $batch.
+        notebooks = self.get_notebooks(expand_sections=True, verbose=False)
+        sections_by_notebook = {nb['id']: self.get_sections(nb['id'], verbose=False) for nb in notebooks}
+        pages_by_section = self.get_pages_batch(
+            [section['id'] for sections in sections_by_notebook.values() for section in sections]
+        )
 
         for notebook in notebooks:
             print(f"📚 {notebook['displayName']}")
-            sections = self.get_sections(notebook['id'])
+            sections = sections_by_notebook[notebook['id']]
 
             for section in sections:
                 print(f"  📂 {section['displayName']}")
-                pages = self.get_pages(section['id'])
+                pages = pages_by_section[section['id']]
 
                 for page in pages:
                     print(f"    📄 {page['title']}")
@@ -589,7 +1406,7 @@ Content-Type: {content_type}\r
 
     def select_notebook_interactive(self):
         """Interactively select a notebook"""
-        notebooks = self.get_notebooks()
+        notebooks = self.get_notebooks(expand_sections=True, verbose=False)
         if not notebooks:
             print("❌ No notebooks found")
             return None
@@ -627,7 +1444,7 @@ Content-Type: {content_type}\r
 
     def select_section_interactive(self, notebook_id):
         """Interactively select a section from a notebook"""
-        sections = self.get_sections(notebook_id)
+        sections = self.get_sections(notebook_id, verbose=False)
         if not sections:
             print("❌ No sections found in this notebook")
             return None
@@ -641,14 +1458,14 @@ Content-Type: {content_type}\r
                 choice = input(f"\nSelect section (1-{len(sections)}) or press Enter for default: ").strip()
 
                 if not choice:
-                    # Try to use default
-                    default_section = self.get_default_section()
+                    # Try to use default, if it is in this notebook
+                    section_ids = {section['id'] for section in sections}
+                    default_section = self.with_default_section(
+                        lambda section: section if section['id'] in section_ids else None)
                     if default_section:
-                        # Check if the default section is in this notebook
-                        for section in sections:
-                            if section['id'] == default_section['id']:
-                                print(f"✅ Using default section: '{default_section['displayName']}'")
-                                return default_section
+                        print(f"✅ Using default section: '{default_section['displayName']}'")
+                        return default_section
+                    if self.get_default_section():
                         print("❌ Default section not found in selected notebook, please select one")
                         continue
                     else:
@@ -697,8 +1514,9 @@ Content-Type: {content_type}\r
             has_image, image_info = self.check_clipboard_for_image()
             if has_image:
                 use_clipboard = input(f"\n🖼️ {image_info}\nInclude clipboard image? (y/n): ").strip().lower()
-                if use_clipboard in ['y', 'yes']:
+                if use_clipboard in _YES:
                     return self.create_page_with_clipboard_image(section['id'], page_title, page_content)
+                self.discard_clipboard_image()
 
         # Create regular page
         return self.create_page(section['id'], page_title, page_content)
@@ -723,8 +1541,13 @@ Content-Type: {content_type}\r
         print("Enter page titles (one per line). Press Enter twice when done, or type 'done' on a new line:")
 
         page_titles = []
+        piped = not sys.stdin.isatty()
         while True:
-            title = input(f"Page {len(page_titles) + 1} title: ").strip()
+            if piped:
+                # Piped input: read lines straight from stdin without a prompt per title
+                title = sys.stdin.readline().strip()
+            else:
+                title = input(f"Page {len(page_titles) + 1} title: ").strip()
             if not title or title.lower() == 'done':
                 break
             page_titles.append(title)
@@ -738,11 +1561,10 @@ Content-Type: {content_type}\r
 
         # Confirm creation
         print(f"\n📋 About to create {len(page_titles)} pages:")
-        for i, title in enumerate(page_titles, 1):
-            print(f"  {i}. {title}")
+        print('\n'.join(f"  {i}. {title}" for i, title in enumerate(page_titles, 1)))
 
         confirm = input(f"\nProceed with creating {len(page_titles)} pages? (y/n): ").strip().lower()
-        if confirm not in ['y', 'yes']:
+        if confirm not in _YES:
             print("❌ Operation cancelled")
             return None
 
@@ -763,14 +1585,17 @@ Content-Type: {content_type}\r
         # Get all *Clean.txt files
         clean_files = []
         try:
-            for filename in os.listdir(udemy_outputs_path):
-                if filename.endswith('- Clean.txt'):
-                    full_path = os.path.join(udemy_outputs_path, filename)
-                    clean_files.append({
-                        'filename': filename,
-                        'path': full_path,
-                        'course_name': filename.replace(' - Clean.txt', '')
-                    })
+            with os.scandir(udemy_outputs_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith('- Clean.txt') and entry.is_file():
+                        course_name = entry.name
+                        if course_name.endswith(' - Clean.txt'):
+                            course_name = course_name[:-len(' - Clean.txt')]
+                        clean_files.append({
+                            'filename': entry.name,
+                            'path': entry.path,
+                            'course_name': course_name
+                        })
         except Exception as e:
             print(f"❌ Error reading Udemy outputs directory: {str(e)}")
             return []
@@ -782,68 +1607,54 @@ Content-Type: {content_type}\r
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error reading file: {str(e)}")
+            return None
 
-            # Extract course name from the header
-            course_name = ""
-            lines = content.split('\n')
-            for line in lines:
-                if line.strip().startswith('COURSE:'):
-                    course_name = line.replace('COURSE:', '').strip()
-                    break
-
-            # Parse the structure - looking for numbered items
-            sections = []
-            current_section = None
-
-            for line in lines:
-                # Keep track of leading whitespace
-                stripped = line.strip()
-                if not stripped or stripped.startswith('#') or stripped.startswith('='):
-                    continue
-
-                # Check if line starts with a number pattern (after stripping)
-                if stripped and stripped[0].isdigit():
-                    # Check if line has leading whitespace (indented items are pages)
-                    has_leading_space = line[0].isspace() if line else False
-
-                    # Split by first period
-                    parts = stripped.split('.', 1)
-                    if len(parts) >= 2:
-                        number_part = parts[0].strip()
-                        rest = parts[1].strip()
-
-                        # Main sections have no leading space and single digit (e.g., "1. Week 1")
-                        if not has_leading_space and number_part.isdigit():
-                            # This is a main section
-                            current_section = {
-                                'number': number_part,
-                                'title': rest,
-                                'pages': []
-                            }
-                            sections.append(current_section)
-
-                        # Sub-items have leading space and dot in number (e.g., "   1.1. Page Title")
-                        elif has_leading_space and current_section and '.' in rest:
-                            # Extract page number and title (e.g., "1" from "1.1. Title")
-                            # The rest is like "1. Title" so split again
-                            sub_parts = rest.split('.', 1)
-                            if len(sub_parts) >= 2:
-                                page_number = number_part + '.' + sub_parts[0].strip()
-                                page_title = sub_parts[1].strip()
-                                if page_title:
-                                    current_section['pages'].append({
-                                        'number': page_number,
-                                        'title': page_title
-                                    })
-
-            return {
-                'course_name': course_name,
-                'sections': sections
-            }
+        # Single pass: pick up the course name from the header and parse the
+        # structure (numbered items) as we go
+        course_name = ""
+        course_name_found = False
+        sections = []
+        current_section = None
+        total_pages = 0
+
+        for line in content.splitlines():
+            # Keep track of leading whitespace
+            stripped = line.strip()
+            if not stripped or stripped[0] in '#=':
+                continue
+
+            if not course_name_found and stripped.startswith('COURSE:'):
+                course_name = line.replace('COURSE:', '').strip()
+                course_name_found = True
+                continue
+
+            if line[0].isspace():
+                # Sub-items are indented (e.g., "   1.1. Page Title")
+                match = _PAGE_LINE_RE.match(line)
+                if match and current_section:
+                    current_section['pages'].append({
+                        'number': f"{match.group(1)}.{match.group(2)}",
+                        'title': match.group(3)
+                    })
+                    total_pages += 1
+            else:
+                # Main sections are not indented (e.g., "1. Week 1")
+                match = _SECTION_LINE_RE.match(line)
+                if match:
+                    current_section = {
+                        'number': match.group(1),
+                        'title': match.group(2),
+                        'pages': []
+                    }
+                    sections.append(current_section)
 
-        except Exception as e:
-            print(f"❌ Error parsing file: {str(e)}")
-            return None
+        return {
+            'course_name': course_name,
+            'sections': sections,
+            'total_pages': total_pages
+        }
 
     def select_udemy_file_interactive(self):
         """Interactively select a Udemy output file"""
@@ -854,14 +1665,13 @@ Content-Type: {content_type}\r
             return None
 
         print("\n📚 Available Udemy Course Output Files:")
-        for i, file_info in enumerate(files, 1):
-            print(f"  {i}. {file_info['course_name']}")
+        print('\n'.join(f"  {i}. {file_info['course_name']}" for i, file_info in enumerate(files, 1)))
 
         while True:
             try:
                 choice = input(f"\nSelect file (1-{len(files)}) or 'q' to quit: ").strip()
 
-                if choice.lower() == 'q':
+                if choice.lower() in _QUIT:
                     return None
 
                 choice_num = int(choice)
@@ -903,8 +1713,8 @@ Content-Type: {content_type}\r
 
         # Show sections
         print("\n📋 Available Sections:")
-        for i, section in enumerate(sections, 1):
-            print(f"  {i}. {section['title']} ({len(section['pages'])} pages)")
+        print('\n'.join(f"  {i}. {section['title']} ({len(section['pages'])} pages)"
+                        for i, section in enumerate(sections, 1)))
 
         # Ask which sections to create
         print("\nOptions:")
@@ -914,18 +1724,20 @@ Content-Type: {content_type}\r
 
         selection = input("\nYour choice: ").strip()
 
-        if selection.lower() == 'q':
+        if selection.lower() in _QUIT:
             print("❌ Operation cancelled")
             return None
 
         # Determine which sections to create
         if not selection:
             selected_sections = sections
+            total_lesson_pages = parsed_data['total_pages']
             print(f"✅ Creating all {len(sections)} sections")
         else:
             try:
                 section_indices = [int(x.strip()) for x in selection.split(',')]
                 selected_sections = [sections[i-1] for i in section_indices if 1 <= i <= len(sections)]
+                total_lesson_pages = sum(len(s['pages']) for s in selected_sections)
                 print(f"✅ Creating {len(selected_sections)} selected sections")
             except (ValueError, IndexError):
                 print("❌ Invalid section selection")
@@ -952,7 +1764,6 @@ Content-Type: {content_type}\r
             strategy = '1'
 
         # Count total pages INCLUDING section pages
-        total_lesson_pages = sum(len(s['pages']) for s in selected_sections)
         total_section_pages = len(selected_sections)
         total_pages = total_lesson_pages + total_section_pages
 
@@ -963,10 +1774,10 @@ Content-Type: {content_type}\r
         print(f"  Lesson pages: {total_lesson_pages}")
         print(f"  Total Pages: {total_pages}")
         print(f"  Destination: {notebook['displayName']} → {section['displayName']}")
-        print(f"  Strategy: {['With numbering', 'Without numbering', 'Numbering + prefix'][int(strategy)-1] if strategy in ['1','2','3'] else 'With numbering'}")
+        print(f"  Strategy: {['With numbering', 'Without numbering', 'Numbering + prefix'][int(strategy)-1] if strategy in _UDEMY_TITLE_STRATEGIES else 'With numbering'}")
 
         confirm = input(f"\n🚀 Create {total_pages} pages? (y/n): ").strip().lower()
-        if confirm not in ['y', 'yes']:
+        if confirm not in _YES:
             print("❌ Operation cancelled")
             return None
 
@@ -975,64 +1786,52 @@ Content-Type: {content_type}\r
         created_count = 0
         failed_count = 0
         failed_pages = []  # Track failed pages for retry
+        planned_pages = []  # Page records in creation order
+
+        # Unknown strategies fall back to the default (with numbering)
+        section_title_fn, page_title_fn = _UDEMY_TITLE_STRATEGIES.get(strategy, _UDEMY_TITLE_STRATEGIES['1'])
 
         for sect in selected_sections:
             # Create section page first
-            if strategy == '1':
-                section_title = f"{sect['number']}. {sect['title']}"
-            elif strategy == '2':
-                section_title = sect['title']
-            elif strategy == '3':
-                section_title = f"{sect['number']}. {sect['title']}"
-            else:
-                section_title = f"{sect['number']}. {sect['title']}"
+            section_title = section_title_fn(sect)
+            planned_pages.append({
+                'type': 'section',
+                'title': section_title,
+                'section_info': sect
+            })
+
+            # Create lesson pages
+            for page_info in sect['pages']:
+                page_title = page_title_fn(sect, page_info)
+                planned_pages.append({
+                    'type': 'lesson',
+                    'title': page_title,
+                    'page_info': page_info,
+                    'section_info': sect
+                })
+
+        # Create everything through $batch; dependsOn chaining keeps the OneNote page order
+        results = self.create_pages_batch(section['id'], [page_record['title'] for page_record in planned_pages])
 
-            print(f"\n📂 Creating section: {section_title}")
-            result = self.create_page(section['id'], section_title, "")
+        # Report one course section (its page plus lessons) per print
+        status_lines = []
+        for page_record, result in zip(planned_pages, results):
+            page_title = page_record['title']
+            if page_record['type'] == 'section':
+                if status_lines:
+                    print('\n'.join(status_lines))
+                status_lines = [f"\n📂 Section: {page_title}"]
 
             if result:
                 created_count += 1
-                print(f"  ✅ [{created_count}/{total_pages}] {section_title}")
+                status_lines.append(f"  ✅ [{created_count}/{total_pages}] {page_title}")
             else:
                 failed_count += 1
-                failed_pages.append({
-                    'type': 'section',
-                    'title': section_title,
-                    'section_info': sect
-                })
-                print(f"  ❌ Failed: {section_title}")
-
-            # Create lesson pages
-            for page_info in sect['pages']:
-                # Build page title based on strategy
-                if strategy == '1':
-                    # Default: With numbering (e.g., "1.1. Day 1 - Lesson Title")
-                    page_title = f"{page_info['number']}. {page_info['title']}"
-                elif strategy == '2':
-                    # Without numbering (e.g., "Day 1 - Lesson Title")
-                    page_title = page_info['title']
-                elif strategy == '3':
-                    # With section prefix (e.g., "Week 1 - 1.1. Lesson Title")
-                    page_title = f"{sect['title']} - {page_info['number']}. {page_info['title']}"
-                else:
-                    # Default fallback
-                    page_title = f"{page_info['number']}. {page_info['title']}"
-
-                # Create the page
-                result = self.create_page(section['id'], page_title, "")
+                failed_pages.append(page_record)
+                status_lines.append(f"  ❌ Failed: {page_title}")
 
-                if result:
-                    created_count += 1
-                    print(f"  ✅ [{created_count}/{total_pages}] {page_title}")
-                else:
-                    failed_count += 1
-                    failed_pages.append({
-                        'type': 'lesson',
-                        'title': page_title,
-                        'page_info': page_info,
-                        'section_info': sect
-                    })
-                    print(f"  ❌ Failed: {page_title}")
+        if status_lines:
+            print('\n'.join(status_lines))
 
         # Final summary
         print(f"\n{'='*50}")
@@ -1047,7 +1846,7 @@ Content-Type: {content_type}\r
             print(f"  {len(failed_pages)} pages failed to create")
             retry = input(f"\nRetry failed pages? (y/n): ").strip().lower()
 
-            if retry in ['y', 'yes']:
+            if retry in _YES:
                 return self._retry_failed_pages(section['id'], failed_pages, strategy, created_count, total_pages)
 
         return {
@@ -1058,13 +1857,13 @@ Content-Type: {content_type}\r
         }
 
     def _retry_failed_pages(self, section_id, failed_pages, strategy, initial_created_count, total_pages):
-        """Retry creating failed pages with authentication refresh"""
+        """Retry creating failed pages with authentication refresh, until they succeed or the user stops"""
         print(f"\n🔄 Retrying {len(failed_pages)} failed pages...")
         print("💡 Tip: If authentication expired, you may need to re-authenticate")
 
         # Ask if user wants to re-authenticate
         reauth = input("\nRe-authenticate before retry? (y/n, recommended if auth expired): ").strip().lower()
-        if reauth in ['y', 'yes']:
+        if reauth in _YES:
             print("\n🔐 Re-authenticating...")
             if not self.authenticate(force_reauth=True):
                 print("❌ Re-authentication failed")
@@ -1076,56 +1875,60 @@ Content-Type: {content_type}\r
                 }
             print("✅ Re-authentication successful!\n")
 
-        retry_created = 0
-        retry_failed = 0
-        still_failed = []
-
-        for i, page_data in enumerate(failed_pages, 1):
-            page_title = page_data['title']
-            print(f"  🔄 [{i}/{len(failed_pages)}] Retrying: {page_title}")
+        created_count = initial_created_count
+        while True:
+            retry_created = 0
+            retry_failed = 0
+            still_failed = []
 
-            result = self.create_page(section_id, page_title, "")
+            results = self.create_pages_batch(section_id, [page_data['title'] for page_data in failed_pages])
 
-            if result:
-                retry_created += 1
-                print(f"  ✅ Success!")
-            else:
-                retry_failed += 1
-                still_failed.append(page_data)
-                print(f"  ❌ Still failed")
+            for i, (page_data, result) in enumerate(zip(failed_pages, results), 1):
+                page_title = page_data['title']
+                print(f"  🔄 [{i}/{len(failed_pages)}] Retrying: {page_title}")
 
-        # Retry summary
-        print(f"\n{'='*50}")
-        print(f"📊 Retry Results:")
-        print(f"  ✅ Successfully created: {retry_created} pages")
-        print(f"  ❌ Still failed: {retry_failed} pages")
-        print(f"\n📈 Overall Progress:")
-        print(f"  ✅ Total created: {initial_created_count + retry_created}/{total_pages}")
-        print(f"  ❌ Total failed: {retry_failed}/{total_pages}")
-        print(f"{'='*50}")
+                if result:
+                    retry_created += 1
+                    print(f"  ✅ Success!")
+                else:
+                    retry_failed += 1
+                    still_failed.append(page_data)
+                    print(f"  ❌ Still failed")
+
+            created_count += retry_created
+            failed_pages = still_failed
+
+            # Retry summary
+            print(f"\n{'='*50}")
+            print(f"📊 Retry Results:")
+            print(f"  ✅ Successfully created: {retry_created} pages")
+            print(f"  ❌ Still failed: {retry_failed} pages")
+            print(f"\n📈 Overall Progress:")
+            print(f"  ✅ Total created: {created_count}/{total_pages}")
+            print(f"  ❌ Total failed: {retry_failed}/{total_pages}")
+            print(f"{'='*50}")
+
+            # Offer another retry if still have failures
+            if not still_failed:
+                break
 
-        # Offer another retry if still have failures
-        if still_failed:
             print(f"\n⚠️ {len(still_failed)} pages still failed")
             another_retry = input(f"Retry again? (y/n): ").strip().lower()
+            if another_retry not in _YES:
+                break
 
-            if another_retry in ['y', 'yes']:
-                return self._retry_failed_pages(section_id, still_failed, strategy,
-                                               initial_created_count + retry_created, total_pages)
+            print(f"\n🔄 Retrying {len(failed_pages)} failed pages...")
 
         return {
-            'created': initial_created_count + retry_created,
-            'failed': retry_failed,
+            'created': created_count,
+            'failed': len(failed_pages),
             'total': total_pages,
-            'failed_pages': still_failed
+            'failed_pages': failed_pages
         }
 
     def _save_failed_pages(self, failed_pages, course_name, section_id):
         """Save failed pages to a JSON file for later retry"""
         try:
-            import json
-            from datetime import datetime
-
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"failed_pages_{timestamp}.json"
 
@@ -1137,8 +1940,12 @@ Content-Type: {content_type}\r
                 'failed_pages': failed_pages
             }
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+            if ORJSON_AVAILABLE:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(save_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(save_data, f, indent=2, ensure_ascii=False)
 
             print(f"\n💾 Failed pages saved to: {filename}")
             print(f"   You can retry these pages later using option 6")
@@ -1150,10 +1957,9 @@ Content-Type: {content_type}\r
     def _load_failed_pages(self, filename):
         """Load failed pages from a JSON file"""
         try:
-            import json
-
-            with open(filename, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
+            with open(filename, 'rb') as f:
+                raw_data = f.read()
+            save_data = orjson.loads(raw_data) if ORJSON_AVAILABLE else json.loads(raw_data)
 
             print(f"\n📂 Loaded failed pages:")
             print(f"   Course: {save_data['course_name']}")
@@ -1173,17 +1979,15 @@ Content-Type: {content_type}\r
         print("🔄 Retry Failed Pages from File")
         print("=" * 40)
 
-        # List available failed page files
-        import os
-        failed_files = [f for f in os.listdir('.') if f.startswith('failed_pages_') and f.endswith('.json')]
+        # List available failed page files, oldest first (names carry a timestamp)
+        failed_files = sorted(glob.glob('failed_pages_*.json'))
 
         if not failed_files:
             print("❌ No saved failed page files found")
             return None
 
         print("\n📋 Available retry files:")
-        for i, filename in enumerate(failed_files, 1):
-            print(f"  {i}. {filename}")
+        print('\n'.join(f"  {i}. {filename}" for i, filename in enumerate(failed_files, 1)))
 
         try:
             choice = input(f"\nSelect file (1-{len(failed_files)}): ").strip()
@@ -1225,35 +2029,23 @@ Content-Type: {content_type}\r
             print("\n❌ Operation cancelled")
             return None
 
-    def quick_create_multiple_pages(self, page_titles, page_content=""):
-        """Create multiple pages with given titles"""
-        created_pages = []
-        failed_pages = []
-
-        print(f"📝 Creating {len(page_titles)} pages...")
-
-        for i, title in enumerate(page_titles, 1):
-            print(f"Creating page {i}/{len(page_titles)}: '{title}'")
-
-            page_data = self.create_page(self.default_section_id, title, page_content)
-            if page_data:
-                created_pages.append(page_data)
-                print(f"✅ Created: '{title}'")
-            else:
-                failed_pages.append(title)
-                print(f"❌ Failed: '{title}'")
-
-        print(f"\n📊 Summary:")
-        print(f"✅ Successfully created: {len(created_pages)} pages")
-        if failed_pages:
-            print(f"❌ Failed to create: {len(failed_pages)} pages")
-            for title in failed_pages:
-                print(f"   - {title}")
+    def parse_titles_input(self, titles_input):
+        """Parse page titles given one per line and/or comma-separated"""
+        return [title.strip() for line in titles_input.splitlines() for title in line.split(',') if title.strip()]
 
-        return created_pages, failed_pages
+    def quick_create_multiple_pages(self, page_titles, page_content=""):
+        """Quickly create multiple pages using default notebook and section"""
+        if self.get_default_section():
+            return self.with_default_section(
+                lambda section: self.create_multiple_pages(section['id'], page_titles, page_content),
+                succeeded=lambda result: bool(result[0]))
+        else:
+            print("❌ Cannot create pages: no default section available")
+            return None
 
 def main():
     """Enhanced main function with interactive options"""
+    onenote = None
     try:
         onenote = OneNoteAutomation()
 
@@ -1289,13 +2081,15 @@ def main():
                         has_image, image_info = onenote.check_clipboard_for_image()
                         if has_image:
                             use_clipboard = input(f"\n🖼️ {image_info}\nInclude clipboard image? (y/n): ").strip().lower()
-                            if use_clipboard in ['y', 'yes']:
-                                section = onenote.get_default_section()
-                                if section:
-                                    onenote.create_page_with_clipboard_image(section['id'], page_title, page_content)
+                            if use_clipboard in _YES:
+                                if onenote.get_default_section():
+                                    onenote.with_default_section(lambda section: onenote.create_page_with_clipboard_image(
+                                        section['id'], page_title, page_content))
                                 else:
+                                    onenote.discard_clipboard_image()
                                     print("❌ No default section available. Please use interactive mode.")
                                 continue
+                            onenote.discard_clipboard_image()
 
                     result = onenote.quick_create_page(page_title, page_content)
                     if not result:
@@ -1319,9 +2113,12 @@ def main():
 
                 titles_input = ""
                 empty_lines = 0
+                piped = not sys.stdin.isatty()
 
                 while empty_lines < 2:
-                    line = input()
+                    line = sys.stdin.readline() if piped else input()
+                    if piped and not line:
+                        break  # End of piped input
                     if line.strip():
                         titles_input += line + "\n"
                         empty_lines = 0
@@ -1333,11 +2130,10 @@ def main():
                 if page_titles:
                     page_content = input(f"\nEnter common content for all {len(page_titles)} pages (optional): ").strip()
                     print(f"\n📋 About to create {len(page_titles)} pages:")
-                    for i, title in enumerate(page_titles, 1):
-                        print(f"  {i}. {title}")
+                    print('\n'.join(f"  {i}. {title}" for i, title in enumerate(page_titles, 1)))
 
                     confirm = input(f"\nProceed with creating {len(page_titles)} pages? (y/n): ").strip().lower()
-                    if confirm in ['y', 'yes']:
+                    if confirm in _YES:
                         result = onenote.quick_create_multiple_pages(page_titles, page_content)
                         if not result:
                             print("💡 Tip: Use interactive mode (option 4) to select notebook/section")
@@ -1375,6 +2171,9 @@ def main():
         print("\n👋 Goodbye!")
     except Exception as e:
         print(f"❌ An error occurred: {str(e)}")
+    finally:
+        if onenote:
+            onenote.close()
 
 if __name__ == "__main__":
     main()
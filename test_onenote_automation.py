@@ -0,0 +1,135 @@
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import http.server
+from unittest import mock
+
+import requests
+
+import onenote_automation
+
+
+class _GraphStub(http.server.BaseHTTPRequestHandler):
+    """Local server that reads each request fully, then answers from the class-level script"""
+    script = []
+    hits = []
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        self.hits.append(self.command)
+        action = self.script.pop(0) if self.script else 'drop'
+        if action == 'drop':
+            # Request was received in full; break the connection before answering
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+            return
+        self.send_response(action)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_GET = _handle
+    do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class GraphRetryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _GraphStub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/pages"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        env = {
+            'CLIENT_ID': '00000000-0000-0000-0000-000000000000',
+            'TOKEN_CACHE_FILE': os.path.join(temp_dir, 'token_cache.json'),
+            'ID_CACHE_FILE': os.path.join(temp_dir, 'id_cache.json'),
+            'GRAPH_MAX_RPS': '0'
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        backoff = mock.patch.object(onenote_automation, '_jittered_backoff', lambda delay: 0)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+
+        self.onenote = onenote_automation.OneNoteAutomation()
+        self.addCleanup(self.onenote.close)
+        # Send plain-HTTP test traffic through the same retrying adapter as Graph calls
+        self.onenote.session.mount('http://', self.onenote.session.get_adapter('https://'))
+        _GraphStub.hits.clear()
+
+    def test_post_is_not_replayed_after_connection_drops(self):
+        _GraphStub.script[:] = ['drop'] * 10
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.onenote.session.post(self.url, data=b'<html></html>')
+        self.assertEqual(_GraphStub.hits, ['POST'])
+
+    def test_get_is_retried_after_connection_drops(self):
+        _GraphStub.script[:] = ['drop', 'drop', 200]
+        response = self.onenote.session.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_GraphStub.hits, ['GET'] * 3)
+
+    def test_post_is_retried_on_503(self):
+        _GraphStub.script[:] = [503, 201]
+        response = self.onenote.session.post(self.url, data=b'<html></html>')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(_GraphStub.hits, ['POST'] * 2)
+
+    def test_post_is_not_retried_on_500(self):
+        _GraphStub.script[:] = [500, 201]
+        response = self.onenote.session.post(self.url, data=b'<html></html>')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(_GraphStub.hits, ['POST'])
+
+
+class CreateMultiplePagesTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        env = {
+            'CLIENT_ID': '00000000-0000-0000-0000-000000000000',
+            'TOKEN_CACHE_FILE': os.path.join(temp_dir, 'token_cache.json'),
+            'ID_CACHE_FILE': os.path.join(temp_dir, 'id_cache.json')
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.onenote = onenote_automation.OneNoteAutomation()
+        self.addCleanup(self.onenote.close)
+        self.sent = []
+        self.onenote.create_page = lambda section_id, title, *args: self.sent.append(title) or {'title': title}
+
+    def test_only_pages_not_applied_are_resent_in_order(self):
+        batch = {'0': {'status': 201, 'body': {'title': 'a'}}, '1': {'status': 500},
+                 '2': {'status': 424}, '3': {'status': 424}}
+        with mock.patch.object(self.onenote, '_graph_batch', return_value=batch), \
+                mock.patch.object(onenote_automation, 'BATCH_MAX_RETRIES', 1):
+            created, failed = self.onenote.create_multiple_pages('s', ['a', 'b', 'c', 'd'])
+        self.assertEqual(self.sent, ['c', 'd'])
+        self.assertEqual(failed, ['b'])
+        self.assertEqual(len(created), 3)
+
+    def test_batch_that_raised_is_not_resent(self):
+        titles = [str(i) for i in range(onenote_automation.GRAPH_BATCH_LIMIT + 2)]
+        error = requests.exceptions.ConnectionError('connection reset')
+        with mock.patch.object(self.onenote, '_graph_batch', side_effect=error):
+            created, failed = self.onenote.create_multiple_pages('s', titles)
+        self.assertEqual(self.sent, titles[onenote_automation.GRAPH_BATCH_LIMIT:])
+        self.assertEqual(failed, titles[:onenote_automation.GRAPH_BATCH_LIMIT])
+
+
+if __name__ == '__main__':
+    unittest.main()